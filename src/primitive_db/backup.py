@@ -0,0 +1,180 @@
+# src/primitive_db/backup.py
+
+"""
+Модуль снимков и резервных копий БД.
+
+Все файлы таблиц и метаданных перезаписываются атомарно (utils.atomic_open):
+новая версия появляется как новый файл, а старая не меняется. Поэтому снимок
+делается жёсткими ссылками на текущие файлы — мгновенно и без остановки
+записи. Копируется только журнал изменений (data/_changes/), который
+дописывается на месте.
+
+Каждая копия содержит manifest.json: для каждого файла БД — его отпечаток
+(размер, время изменения, inode) и папку копии, где лежит его содержимое.
+Инкрементальная копия сохраняет только файлы, изменившиеся с прошлой копии,
+а для остальных ссылается на предыдущие копии.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from src.decorators import confirm_action, handle_db_errors
+
+from . import cdc, utils
+
+MANIFEST = "manifest.json"
+
+
+def state_file():
+    """Файл с путём к последней резервной копии (рядом с metadata.json)"""
+    return Path(utils.METADATA_FILE).with_name("last_backup.json")
+
+
+def _db_files():
+    """
+    Все файлы БД: {относительный путь: абсолютный путь}.
+    Пути относительны папки, в которой лежит metadata.json.
+    """
+    root = Path(utils.METADATA_FILE).parent
+    files = {}
+    if Path(utils.METADATA_FILE).exists():
+        files["metadata.json"] = Path(utils.METADATA_FILE)
+    if utils.DATA_DIR.exists():
+        for path in sorted(utils.DATA_DIR.rglob("*")):
+            if path.is_file() and path.suffix != ".tmp":
+                files[path.relative_to(root).as_posix()] = path
+    return files
+
+
+def _fingerprint(path):
+    """Отпечаток файла: меняется при каждой перезаписи или дописывании"""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+
+def _store(path, target):
+    """
+    Кладёт файл в копию: жёсткой ссылкой, если файл только заменяется
+    целиком, иначе — копированием (другой диск). Сегменты журнала
+    изменений дописываются на месте, поэтому копируются только до
+    последней целой строки: недописанное событие в копию не попадает.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".log" and cdc.changes_dir() in path.parents:
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(target, 'wb') as f:
+            f.write(data[:data.rfind(b"\n") + 1])
+        return
+    if cdc.changes_dir() not in path.parents:
+        try:
+            os.link(path, target)
+            return
+        except OSError:
+            pass
+    shutil.copy2(path, target)
+
+
+def _load_manifest(backup_dir):
+    with open(Path(backup_dir) / MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@handle_db_errors
+def backup(target_dir: str, incremental: bool = False) -> str:
+    """
+    Делает резервную копию БД в папку target_dir.
+
+    Args:
+        target_dir: новая (или пустая) папка для копии.
+        incremental: сохранить только файлы, изменившиеся с последней копии;
+            без предыдущей копии делается полная.
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    target = Path(target_dir).resolve()
+    if target.exists() and any(target.iterdir()):
+        return f'Ошибка: папка "{target_dir}" не пуста.'
+
+    previous = {}
+    parent = None
+    if incremental and state_file().exists():
+        with open(state_file(), 'r', encoding='utf-8') as f:
+            parent = Path(json.load(f)["path"])
+        if (parent / MANIFEST).exists():
+            previous = _load_manifest(parent)["files"]
+        else:
+            parent = None
+
+    target.mkdir(parents=True, exist_ok=True)
+    files = {}
+    copied = 0
+    for rel, path in _db_files().items():
+        fingerprint = _fingerprint(path)
+        old = previous.get(rel)
+        if old and {k: old[k] for k in fingerprint} == fingerprint:
+            # Файл не менялся — берём его из предыдущей копии
+            source = (parent / old["source"]).resolve()
+        else:
+            _store(path, target / rel)
+            source = target
+            copied += 1
+        files[rel] = {**fingerprint, "source": os.path.relpath(source, target)}
+
+    manifest = {
+        "created": time.time(),
+        "parent": os.path.relpath(parent, target) if parent else None,
+        "files": files,
+    }
+    with utils.atomic_open(target / MANIFEST) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    with utils.atomic_open(state_file()) as f:
+        json.dump({"path": str(target)}, f, ensure_ascii=False)
+
+    kind = "Инкрементальная копия сохранена" if parent else "Снимок сохранён"
+    return f'{kind} успешно в "{target_dir}": файлов {len(files)}, скопировано {copied}.' # noqa: E501
+
+
+@handle_db_errors
+@confirm_action("восстановление из резервной копии")
+def restore(source_dir: str) -> str:
+    """
+    Восстанавливает БД из полной или инкрементальной копии.
+
+    Файлы берутся из тех копий, на которые ссылается manifest.json, и
+    копируются (не связываются), чтобы дальнейшая запись не меняла копию.
+    Файлы БД, которых нет в копии, удаляются.
+
+    Args:
+        source_dir: папка копии.
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    source = Path(source_dir).resolve()
+    manifest = _load_manifest(source)
+    root = Path(utils.METADATA_FILE).parent
+
+    plan = {}
+    for rel, entry in manifest["files"].items():
+        path = (source / entry["source"]).resolve() / rel
+        if not path.exists():
+            raise FileNotFoundError(f"В копии нет файла {path}")
+        plan[rel] = path
+
+    for rel, path in _db_files().items():
+        if rel not in plan:
+            path.unlink()
+    for rel, path in plan.items():
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'rb') as src, utils.atomic_open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+
+    return f'БД успешно восстановлена из "{source_dir}": файлов {len(plan)}.'
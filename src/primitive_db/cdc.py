@@ -0,0 +1,213 @@
+# src/primitive_db/cdc.py
+
+"""
+Модуль журнала изменений (change data capture).
+
+Каждое изменение записи через insert/update/delete становится событием
+с порядковым смещением (offset). События хранятся в ограниченном кольцевом
+журнале data/_changes/: сегменты по SEGMENT_SIZE событий, при превышении
+MAX_SEGMENTS самый старый сегмент удаляется.
+"""
+
+import json
+import time
+
+from . import utils
+
+# Размер сегмента журнала и число хранимых сегментов
+SEGMENT_SIZE = 1000
+MAX_SEGMENTS = 10
+
+# Раз во сколько событий subscribe сохраняет смещение потребителя
+BATCH_SIZE = 100
+
+
+def changes_dir():
+    """Папка журнала изменений: data/_changes/"""
+    return utils.DATA_DIR / "_changes"
+
+
+def _segments():
+    """Начальные смещения существующих сегментов по возрастанию"""
+    folder = changes_dir()
+    if not folder.exists():
+        return []
+    return sorted(int(p.stem) for p in folder.glob("*.log"))
+
+
+def _segment_path(start):
+    return changes_dir() / f"{start:012d}.log"
+
+
+def _read_segment(start):
+    """
+    Читает события сегмента. Последняя строка без перевода строки —
+    недописанное событие (сбой при записи, копия во время дописывания),
+    она пропускается.
+    """
+    with open(_segment_path(start), 'r', encoding='utf-8') as f:
+        lines = f.read().split("\n")
+    # После последнего "\n" остаётся либо пустая строка, либо обрывок
+    return [json.loads(line) for line in lines[:-1] if line.strip()]
+
+
+def _repair_segment(start):
+    """Обрезает недописанную последнюю строку сегмента, если она есть"""
+    file_path = _segment_path(start)
+    if not file_path.exists():
+        return
+    with open(file_path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+def oldest_offset():
+    """Смещение самого старого события, которое ещё хранится в журнале"""
+    segments = _segments()
+    return segments[0] if segments else next_offset()
+
+
+def next_offset():
+    """Смещение, которое получит следующее событие"""
+    segments = _segments()
+    if not segments:
+        return 0
+    return segments[-1] + len(_read_segment(segments[-1]))
+
+
+def _clean(row):
+    """Убирает из записи служебные поля"""
+    if row is None:
+        return None
+    return {key: value for key, value in row.items() if key != "_v"}
+
+
+def publish_changes(table_name, changes):
+    """
+    Дописывает в журнал события по изменениям таблицы.
+
+    Args:
+        table_name: имя изменённой таблицы.
+        changes: список пар (запись до, запись после); для вставки
+            «до» равно None, для удаления «после» равно None.
+    """
+    if not changes:
+        return
+    changes_dir().mkdir(parents=True, exist_ok=True)
+
+    segments = _segments()
+    start = segments[-1] if segments else 0
+    # Обрывок после сбоя иначе склеился бы со следующим событием
+    _repair_segment(start)
+    offset = next_offset()
+    f = open(_segment_path(start), 'a', encoding='utf-8')
+    try:
+        for before, after in changes:
+            if offset - start >= SEGMENT_SIZE:
+                # Сегмент заполнен — начинаем новый
+                f.close()
+                start = offset
+                segments.append(start)
+                f = open(_segment_path(start), 'a', encoding='utf-8')
+            if before is None:
+                op = "insert"
+            elif after is None:
+                op = "delete"
+            else:
+                op = "update"
+            event = {
+                "offset": offset,
+                "time": time.time(),
+                "table": table_name,
+                "op": op,
+                "id": (after or before)["ID"],
+                "before": _clean(before),
+                "after": _clean(after),
+            }
+            # Событие пишется одной целой строкой и сразу сбрасывается на диск
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            offset += 1
+    finally:
+        f.close()
+
+    # Кольцевой буфер: старые сегменты вытесняются
+    for old in segments[:-MAX_SEGMENTS]:
+        _segment_path(old).unlink(missing_ok=True)
+
+
+def load_offset(consumer):
+    """Сохранённое смещение потребителя (0, если его ещё не было)"""
+    file_path = changes_dir() / "offsets.json"
+    if not file_path.exists():
+        return 0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get(consumer, 0)
+
+
+def save_offset(consumer, offset):
+    """Сохраняет смещение, с которого потребитель продолжит чтение"""
+    changes_dir().mkdir(parents=True, exist_ok=True)
+    file_path = changes_dir() / "offsets.json"
+    offsets = {}
+    if file_path.exists():
+        with open(file_path, 'r', encoding='utf-8') as f:
+            offsets = json.load(f)
+    offsets[consumer] = offset
+    with utils.atomic_open(file_path) as f:
+        json.dump(offsets, f, ensure_ascii=False, indent=2)
+
+
+def subscribe(table_name, offset=None, consumer=None, batch_size=BATCH_SIZE):
+    """
+    Итератор событий таблицы, начиная со смещения offset.
+
+    Журнал читается по одному сегменту по мере потребления, поэтому
+    скорость чтения задаёт потребитель. Если указан consumer, начальное
+    смещение (когда offset не передан) берётся из сохранённого. Новое
+    смещение сохраняется раз в batch_size обработанных событий, а также
+    когда журнал дочитан или итератор закрыт (close()): тогда последнее
+    выданное событие считается обработанным.
+
+    Бросает ValueError, если события с offset уже вытеснены из журнала
+    или offset больше смещения следующего события. Сохранённое смещение
+    за концом журнала (например, после restore из старой копии)
+    приводится к концу журнала.
+    """
+    end = next_offset()
+    if offset is None:
+        offset = min(load_offset(consumer), end) if consumer else 0
+    if offset > end:
+        raise ValueError(
+            f"Смещение {offset} за концом журнала (следующее событие — {end})."
+        )
+    if offset < oldest_offset():
+        raise ValueError(
+            f"События до смещения {oldest_offset()} уже удалены из журнала "
+            f"(запрошено {offset})."
+        )
+
+    position = offset
+    pending = 0
+    try:
+        for start in _segments():
+            if start + SEGMENT_SIZE <= offset:
+                continue
+            for event in _read_segment(start):
+                if event["offset"] < position:
+                    continue
+                # События других таблиц тоже сдвигают смещение потребителя
+                position = event["offset"] + 1
+                if event["table"] != table_name:
+                    continue
+                yield event
+                pending += 1
+                if consumer and pending >= batch_size:
+                    save_offset(consumer, position)
+                    pending = 0
+        position = max(position, next_offset())
+    finally:
+        if consumer:
+            save_offset(consumer, position)
@@ -11,6 +11,7 @@ from typing import Any, Dict, List
 from src.decorators import confirm_action, create_cacher, handle_db_errors, log_time
 
 SUPPORTED_TYPES = {"int", "str", "bool"}
+STORAGE_FORMATS = {"json", "zlib", "lzma"}
 
 # --- Пути ---
 METADATA_FILE = Path(__file__).parent / "metadata.json"
@@ -30,11 +31,25 @@ def load_metadata() -> Dict[str, Any]:
 
 
 def save_metadata(metadata: Dict[str, Any]) -> None:
-    """Сохраняет метаданные в файл."""
-    with open(METADATA_FILE, 'w', encoding='utf-8') as f:
+    """Сохраняет метаданные в файл (атомарно, см. utils.atomic_open)."""
+    from primitive_db.utils import atomic_open
+    with atomic_open(METADATA_FILE) as f:
         json.dump(metadata, f, ensure_ascii=False, indent=2)
 
 
+def _cast_value(raw_value: str, col_type: str) -> Any:
+    """Преобразует строковое значение из команды к типу столбца."""
+    if col_type == "int":
+        # Удаляем кавычки и преобразуем в число
+        cleaned = raw_value.strip('"').strip("'")
+        return int(cleaned)
+    if col_type == "bool":
+        cleaned = raw_value.strip('"').strip("'").lower()
+        return cleaned in ("true", "1", "yes")
+    # Для строк удаляем кавычки
+    return raw_value.strip('"').strip("'")
+
+
 # --- CRUD: Insert ---
 @handle_db_errors
 @log_time
@@ -59,10 +74,18 @@ def insert(
             f"получено {len(values)}."
         )
 
-    from primitive_db.utils import load_table_data, save_table_data
-    data = load_table_data(table_name)
-
-    new_id = max((row["ID"] for row in data), default=0) + 1
+    from primitive_db.utils import (
+        append_row,
+        load_last_id,
+        load_table_data,
+        save_table_data,
+    )
+    if table.get("partition"):
+        # Секционированная таблица: читаем только счётчик ID
+        new_id = load_last_id(table_name, table) + 1
+    else:
+        data = load_table_data(table_name, table)
+        new_id = max((row["ID"] for row in data), default=0) + 1
     new_row = {"ID": new_id}
 
     value_index = 0
@@ -74,16 +97,7 @@ def insert(
         value_index += 1
 
         try:
-            if col_type == "int":
-                # Удаляем кавычки и преобразуем в число
-                cleaned = raw_value.strip('"').strip("'")
-                new_row[col_name] = int(cleaned)
-            elif col_type == "bool":
-                cleaned = raw_value.strip('"').strip("'").lower()
-                new_row[col_name] = cleaned in ("true", "1", "yes")
-            else:  # str
-                # Для строк удаляем кавычки
-                new_row[col_name] = raw_value.strip('"').strip("'")
+            new_row[col_name] = _cast_value(raw_value, col_type)
         except ValueError as e:
             return (
                 f"Ошибка: значение '{raw_value}' не соответствует типу "
@@ -92,15 +106,22 @@ def insert(
         except Exception as e:
             return f"Ошибка обработки значения '{raw_value}'. Детали: {e}"
 
-    data.append(new_row)
-    save_table_data(table_name, data)
+    if table.get("schema_version"):
+        new_row["_v"] = table["schema_version"]
+
+    if table.get("partition"):
+        append_row(table_name, table, new_row)
+    else:
+        data.append(new_row)
+        save_table_data(table_name, data, table)
+    record_changes(metadata, table_name, [(None, new_row)])
     return f"Запись с ID={new_id} успешно добавлена в таблицу '{table_name}'."
 
 
 # --- CRUD: Select ---
 @handle_db_errors
 @log_time
-def select(table_data: List[Dict], where_clause=None) -> List[Dict]:
+def select(table_data: List[Dict], where_clause=None, cached=True) -> List[Dict]:
     """
     Возвращает отфильтрованные данные с кэшированием.
 
@@ -108,6 +129,9 @@ def select(table_data: List[Dict], where_clause=None) -> List[Dict]:
     Args:
         table_data: список записей таблицы.
         where_clause: словарь условий фильтрации (ключ-значение).
+        cached: False — фильтровать без кэша. Нужно для представлений:
+            их данные меняются без изменения числа записей, а ключ кэша
+            зависит только от числа записей и условия.
 
 
     Returns:
@@ -134,20 +158,32 @@ def select(table_data: List[Dict], where_clause=None) -> List[Dict]:
                 result.append(row)
         return result
     
+    if not cached:
+        return get_data()
+
     # Используем кэш
     return select_cache(key, get_data)
 
 
 # --- CRUD: Update ---
 @handle_db_errors
-def update(table_data: List[Dict], set_clause: Dict, where_clause: Dict) -> int:
+def update(
+    table_data: List[Dict], set_clause: Dict, where_clause: Dict, changes=None
+) -> int:
     """
     Обновляет поля в записях по условию.
 
+    Работает только со списком в памяти: не сохраняет таблицу и не
+    публикует изменения. Чтобы изменение попало в журнал изменений и
+    представления, используйте update_table или после сохранения
+    вызовите record_changes с заполненным списком changes.
+
     Args:
         table_data: список записей таблицы.
         set_clause: словарь новых значений (ключ-значение).
         where_clause: условия для выбора записей.
+        changes: если передан список — в него добавляются пары
+            (запись до, запись после) для record_changes.
 
     Returns:
         Количество обновлённых записей.
@@ -161,9 +197,12 @@ def update(table_data: List[Dict], set_clause: Dict, where_clause: Dict) -> int:
                 match = False
                 break
         if match:
+            before = dict(row)
             for key, value in set_clause.items():
                 if key in row:
                     row[key] = value
+            if changes is not None:
+                changes.append((before, row))
             updated_count += 1
     return updated_count
 
@@ -171,13 +210,20 @@ def update(table_data: List[Dict], set_clause: Dict, where_clause: Dict) -> int:
 # --- CRUD: Delete ---
 @handle_db_errors
 @confirm_action("удаление записей")
-def delete(table_data: List[Dict], where_clause: Dict) -> List[Dict]:
+def delete(table_data: List[Dict], where_clause: Dict, changes=None) -> List[Dict]:
     """
     Удаляет записи по условию.
 
+    Работает только со списком в памяти: не сохраняет таблицу и не
+    публикует изменения. Чтобы изменение попало в журнал изменений и
+    представления, используйте delete_from или после сохранения
+    вызовите record_changes с заполненным списком changes.
+
     Args:
         table_data: список записей таблицы.
         where_clause: условия для удаления.
+        changes: если передан список — в него добавляются пары
+            (удалённая запись, None) для record_changes.
 
     Returns:
         Список оставшихся записей.
@@ -192,12 +238,113 @@ def delete(table_data: List[Dict], where_clause: Dict) -> List[Dict]:
                 break
         if not match:
             result.append(row)
+        elif changes is not None:
+            changes.append((row, None))
     return result
 
 
+# --- CRUD по имени таблицы ---
+@handle_db_errors
+def update_table(
+    metadata: Dict, table_name: str, set_clause: Dict, where_clause: Dict
+) -> int:
+    """
+    Обновляет записи таблицы по условию: загружает нужные секции,
+    применяет update, сохраняет и публикует изменения (record_changes).
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя таблицы.
+        set_clause: словарь новых значений (ключ-значение).
+        where_clause: условия для выбора записей.
+
+    Returns:
+        Количество обновлённых записей.
+    """
+
+    if table_name not in metadata["tables"]:
+        raise KeyError(table_name)
+
+    from primitive_db.utils import load_table_data, save_table_data
+    table = metadata["tables"][table_name]
+    data = load_table_data(table_name, table, where_clause)
+    changes = []
+    updated = update(data, set_clause, where_clause, changes)
+    if updated:
+        save_table_data(table_name, data, table, where_clause)
+        record_changes(metadata, table_name, changes)
+    return updated
+
+
+@handle_db_errors
+def delete_from(metadata: Dict, table_name: str, where_clause: Dict):
+    """
+    Удаляет записи таблицы по условию (с подтверждением, см. delete),
+    сохраняет таблицу и публикует изменения (record_changes).
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя таблицы.
+        where_clause: условия для удаления.
+
+    Returns:
+        Количество удалённых записей или None, если операция отменена.
+    """
+
+    if table_name not in metadata["tables"]:
+        raise KeyError(table_name)
+
+    from primitive_db.utils import load_table_data, save_table_data
+    table = metadata["tables"][table_name]
+    data = load_table_data(table_name, table, where_clause)
+    changes = []
+    remaining = delete(data, where_clause, changes)
+    if remaining is None:
+        return None
+    if changes:
+        save_table_data(table_name, remaining, table, where_clause)
+        record_changes(metadata, table_name, changes)
+    return len(changes)
+
+
 # --- Управление таблицами ---
+def _parse_partition(spec: List[str], columns: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Разбирает описание секционирования: ["range(ID)", "into", "N"] или
+    ["hash(столбец)", "into", "N"].
+
+    Для range N — число ID в одной секции (число секций растёт вместе с
+    таблицей), для hash — фиксированное число секций.
+    Бросает ValueError при некорректном описании.
+    """
+    usage = "используйте range(ID) into N или hash(столбец) into N"
+    if len(spec) != 3 or spec[1] != "into" or not spec[0].endswith(")"):
+        raise ValueError(f"Некорректное секционирование: {usage}.")
+
+    kind, _, column = spec[0][:-1].partition("(")
+    column = column.strip()
+    try:
+        number = int(spec[2])
+    except ValueError:
+        raise ValueError(f"Некорректное число секций: {spec[2]}.") from None
+    if number < 1:
+        raise ValueError(f"Некорректное число секций: {spec[2]}.")
+
+    if kind == "range":
+        if column != "ID":
+            raise ValueError("Секционирование по диапазону возможно только по ID.")
+        return {"kind": "range", "column": "ID", "size": number}
+    if kind == "hash":
+        if column not in columns:
+            raise ValueError(f'Столбец "{column}" не найден в таблице.')
+        return {"kind": "hash", "column": column, "count": number}
+    raise ValueError(f"Некорректное секционирование: {usage}.")
+
+
 @handle_db_errors
-def create_table(metadata: Dict, table_name: str, columns: List[str]) -> str:
+def create_table(
+    metadata: Dict, table_name: str, columns: List[str], partition=None
+) -> str:
     """
     Создаёт таблицу с ID:int.
 
@@ -205,12 +352,14 @@ def create_table(metadata: Dict, table_name: str, columns: List[str]) -> str:
         metadata: словарь метаданных БД.
         table_name: имя новой таблицы.
         columns: список столбцов в формате "имя:тип".
+        partition: описание секционирования (слова после "partition by"),
+            например ["hash(name)", "into", "4"]; None — без секций.
 
     Returns:
         Сообщение о результате.
     """
 
-    if table_name in metadata["tables"]:
+    if table_name in metadata["tables"] or table_name in metadata.get("views", {}):
         return f'Ошибка: Таблица "{table_name}" уже существует.'
 
     table_columns = {"ID": "int"}
@@ -232,7 +381,14 @@ def create_table(metadata: Dict, table_name: str, columns: List[str]) -> str:
 
         table_columns[col_name] = col_type
 
-    metadata["tables"][table_name] = {"columns": table_columns, "data": []}
+    table = {"columns": table_columns, "data": []}
+    if partition:
+        try:
+            table["partition"] = _parse_partition(partition, table_columns)
+        except ValueError as e:
+            return f"Ошибка: {e}"
+
+    metadata["tables"][table_name] = table
     return f'Таблица "{table_name}" успешно создана со столбцами: {", ".join([f"{k}:{v}" for k, v in table_columns.items()])}' # noqa: E501
 
 @handle_db_errors
@@ -251,6 +407,9 @@ def drop_table(metadata: Dict, table_name: str) -> str:
 
     if table_name not in metadata["tables"]:
         return f'Ошибка: Таблица "{table_name}" не существует.'
+    views = _views_of(metadata, table_name)
+    if views:
+        return f'Ошибка: от таблицы "{table_name}" зависят представления: {", ".join(views)}.' # noqa: E501
     del metadata["tables"][table_name]
     return f'Таблица "{table_name}" успешно удалена.'
 
@@ -268,4 +427,365 @@ def list_tables(metadata: Dict) -> str:
 
     if not metadata.get("tables"):
         return "Нет созданных таблиц."
-    return "\n".join(f"- {name}" for name in sorted(metadata["tables"]))
+    lines = [f"- {name}" for name in sorted(metadata["tables"])]
+    lines += [f"- {name} (представление)" for name in sorted(metadata.get("views", {}))]
+    return "\n".join(lines)
+
+@handle_db_errors
+def alter_table(
+    metadata: Dict, table_name: str, action: str, args: List[str]
+) -> str:
+    """
+    Изменяет схему таблицы без перезаписи данных.
+
+    Каждое изменение увеличивает версию схемы и записывается в
+    table["schema_changes"]. Сами записи обновляются лениво — при чтении
+    (см. utils.upgrade_rows), поэтому операция не зависит от размера таблицы.
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя таблицы.
+        action: "add" или "drop".
+        args: для add — ["столбец:тип"] или ["столбец:тип", "default", знач];
+              для drop — ["столбец"].
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    if table_name not in metadata["tables"]:
+        return f'Ошибка: Таблица "{table_name}" не существует.'
+
+    table = metadata["tables"][table_name]
+    columns = table["columns"]
+    version = table.get("schema_version", 0) + 1
+
+    if action == "add":
+        if len(args) not in (1, 3) or (len(args) == 3 and args[1] != "default"):
+            return "Использование: alter_table <имя> add <столбец:тип> [default знач]"
+        if ":" not in args[0]:
+            return f'Некорректное значение: {args[0]}. Используйте формат "столбец:тип".' # noqa: E501
+
+        col_name, col_type = args[0].split(":", 1)
+        col_name = col_name.strip()
+        col_type = col_type.strip()
+
+        if not col_name:
+            return "Некорректное значение: имя столбца не может быть пустым."
+        if col_type not in SUPPORTED_TYPES:
+            return f'Некорректное значение: {col_type}. Поддерживаемые типы: {", ".join(SUPPORTED_TYPES)}.' # noqa: E501
+        if col_name in columns:
+            return f'Ошибка: Столбец "{col_name}" уже определён в таблице.'
+
+        default = None
+        if len(args) == 3:
+            try:
+                default = _cast_value(args[2], col_type)
+            except ValueError:
+                return (
+                    f"Ошибка: значение по умолчанию '{args[2]}' не соответствует "
+                    f"типу '{col_type}'."
+                )
+
+        columns[col_name] = col_type
+        change = {
+            "version": version, "op": "add", "column": col_name,
+            "type": col_type, "default": default,
+        }
+        message = f'Столбец "{col_name}:{col_type}" успешно добавлен в таблицу "{table_name}"' # noqa: E501
+
+    elif action == "drop":
+        if len(args) != 1:
+            return "Использование: alter_table <имя> drop <столбец>"
+        col_name = args[0]
+        if col_name == "ID":
+            return 'Ошибка: столбец "ID" удалить нельзя.'
+        if col_name not in columns:
+            return f'Ошибка: Столбец "{col_name}" не найден в таблице.'
+        if table.get("partition", {}).get("column") == col_name:
+            return f'Ошибка: по столбцу "{col_name}" секционирована таблица.'
+        views = [
+            name for name in _views_of(metadata, table_name)
+            if col_name in _view_source_columns(metadata["views"][name])
+        ]
+        if views:
+            return f'Ошибка: столбец "{col_name}" используется в представлениях: {", ".join(views)}.' # noqa: E501
+
+        del columns[col_name]
+        change = {"version": version, "op": "drop", "column": col_name}
+        message = f'Столбец "{col_name}" успешно удалён из таблицы "{table_name}"'
+
+    else:
+        return f"Неизвестное действие: {action}. Используйте add или drop."
+
+    table["schema_version"] = version
+    table.setdefault("schema_changes", []).append(change)
+    return f"{message} (версия схемы {version})."
+
+
+@handle_db_errors
+def rewrite_table(metadata: Dict, table_name: str) -> str:
+    """
+    Переписывает все записи таблицы в текущей версии схемы.
+
+    Нужна только для того, чтобы избавиться от ленивого обновления
+    старых записей при чтении; на результат запросов не влияет.
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя таблицы.
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    if table_name not in metadata["tables"]:
+        return f'Ошибка: Таблица "{table_name}" не существует.'
+
+    from primitive_db.utils import upgrade_table
+    if upgrade_table(table_name, metadata["tables"][table_name]):
+        return f'Таблица "{table_name}" успешно переписана в текущей схеме.'
+    return f'Таблица "{table_name}" уже в текущей схеме.'
+
+
+@handle_db_errors
+def set_storage(
+    metadata: Dict, table_name: str, storage_format: str, options: List[str]
+) -> str:
+    """
+    Меняет формат хранения таблицы и переписывает её данные в новом формате.
+
+    Блочный формат (zlib/lzma) делит записи на блоки по block_size, сжимает
+    каждый блок и хранит в заголовке min/max и число пустых значений
+    по столбцам, чтобы select пропускал неподходящие блоки.
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя таблицы.
+        storage_format: "json", "zlib" или "lzma".
+        options: параметры вида "level=N" (0-9) и "block_size=N".
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    if table_name not in metadata["tables"]:
+        return f'Ошибка: Таблица "{table_name}" не существует.'
+    if storage_format not in STORAGE_FORMATS:
+        return f'Некорректное значение: {storage_format}. Поддерживаемые форматы: {", ".join(sorted(STORAGE_FORMATS))}.' # noqa: E501
+
+    storage = {"format": storage_format}
+    for option in options:
+        key, _, value = option.partition("=")
+        if key not in ("level", "block_size") or storage_format == "json":
+            return f"Некорректный параметр: {option}."
+        try:
+            storage[key] = int(value)
+        except ValueError:
+            return f"Некорректное значение параметра: {option}."
+    if not 0 <= storage.get("level", 0) <= 9:
+        return "Ошибка: level должен быть от 0 до 9."
+    if storage.get("block_size", 1) < 1:
+        return "Ошибка: block_size должен быть больше 0."
+
+    from primitive_db.utils import load_table_data, save_table_data, table_files
+    table = metadata["tables"][table_name]
+    data = load_table_data(table_name, table)
+    old_files = table_files(table_name, table)
+
+    if storage_format == "json":
+        table.pop("storage", None)
+    else:
+        table["storage"] = storage
+    save_table_data(table_name, data, table)
+
+    new_files = set(table_files(table_name, table))
+    for file_path in old_files:
+        if file_path not in new_files:
+            file_path.unlink()
+    return f'Формат хранения таблицы "{table_name}" успешно изменён на {storage_format}.' # noqa: E501
+
+
+# --- Материализованные представления ---
+def _matches(row: Dict, where_clause) -> bool:
+    """Проверяет запись на соответствие условию where (как в select)."""
+    if not where_clause:
+        return True
+    return all(str(row.get(key)) == str(value) for key, value in where_clause.items())
+
+
+def _views_of(metadata: Dict, table_name: str) -> List[str]:
+    """Имена представлений, построенных по таблице."""
+    return sorted(
+        name for name, view in metadata.get("views", {}).items()
+        if view["table"] == table_name
+    )
+
+
+def _view_source_columns(view: Dict) -> List[str]:
+    """Столбцы базовой таблицы, от которых зависит представление."""
+    columns = list(view.get("columns") or [])
+    columns += [col for _, col in view.get("aggregates") or [] if col]
+    columns += list(view.get("where") or {})
+    return columns
+
+
+def view_columns(view: Dict) -> List[str]:
+    """Столбцы, которые хранит и показывает представление."""
+    if view.get("aggregates"):
+        return [f"{func}({col})" if col else func for func, col in view["aggregates"]]
+    return ["ID"] + [col for col in view["columns"] if col != "ID"]
+
+
+def _apply_view_changes(view: Dict, rows: List[Dict], changes: List) -> None:
+    """
+    Применяет к данным представления изменения базовой таблицы.
+
+    changes — пары (запись до, запись после), None для вставки/удаления.
+    Стоимость зависит от размера представления и числа изменений,
+    но не от размера базовой таблицы.
+    """
+    if view.get("aggregates"):
+        result = rows[0]
+        for before, after in changes:
+            for row, sign in ((before, -1), (after, 1)):
+                if row is None or not _matches(row, view["where"]):
+                    continue
+                for func, col in view["aggregates"]:
+                    key = f"{func}({col})" if col else func
+                    value = 1 if func == "count" else row.get(col)
+                    if isinstance(value, int):
+                        result[key] += sign * value
+        return
+
+    by_id = {row["ID"]: row for row in rows}
+    columns = view_columns(view)
+    for before, after in changes:
+        by_id.pop((after or before)["ID"], None)
+        if after is not None and _matches(after, view["where"]):
+            by_id[after["ID"]] = {col: after.get(col) for col in columns}
+    rows[:] = sorted(by_id.values(), key=lambda row: row["ID"])
+
+
+def record_changes(metadata: Dict, table_name: str, changes: List) -> None:
+    """
+    Фиксирует изменения записей таблицы после их сохранения на диск:
+    публикует их в журнал изменений (см. cdc) и инкрементально обновляет
+    построенные по таблице представления.
+
+    Args:
+        metadata: словарь метаданных БД.
+        table_name: имя изменённой таблицы.
+        changes: список пар (запись до, запись после); для вставки
+            «до» равно None, для удаления «после» равно None.
+    """
+    if not changes:
+        return
+
+    from primitive_db.cdc import publish_changes
+    from primitive_db.utils import load_table_data, save_table_data
+
+    publish_changes(table_name, changes)
+    for name in _views_of(metadata, table_name):
+        view = metadata["views"][name]
+        rows = load_table_data(name)
+        _apply_view_changes(view, rows, changes)
+        save_table_data(name, rows)
+
+
+@handle_db_errors
+def create_view(
+    metadata: Dict,
+    view_name: str,
+    table_name: str,
+    projection: List[str],
+    where_clause=None,
+) -> str:
+    """
+    Создаёт материализованное представление.
+
+    Результат запроса хранится как обычная таблица data/<view_name>.json и
+    дальше поддерживается инкрементально: insert/update/delete базовой
+    таблицы применяют к нему только своё изменение (см. record_changes).
+
+    Args:
+        metadata: словарь метаданных БД.
+        view_name: имя представления.
+        table_name: имя базовой таблицы.
+        projection: список столбцов ("*" — все) или агрегатов
+            count / sum(столбец).
+        where_clause: условие фильтрации (ключ-значение) или None.
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    metadata.setdefault("views", {})
+    if view_name in metadata["tables"] or view_name in metadata["views"]:
+        return f'Ошибка: Таблица "{view_name}" уже существует.'
+    if table_name not in metadata["tables"]:
+        return f'Ошибка: Таблица "{table_name}" не существует.'
+
+    table_columns = metadata["tables"][table_name]["columns"]
+    for key in where_clause or {}:
+        if key not in table_columns:
+            return f'Ошибка: Столбец "{key}" не найден в таблице.'
+
+    columns, aggregates = [], []
+    for item in projection:
+        if item == "*":
+            columns.extend(table_columns)
+        elif item == "count":
+            aggregates.append(["count", None])
+        elif item.startswith("sum(") and item.endswith(")"):
+            col = item[4:-1].strip()
+            if table_columns.get(col) not in ("int", "bool"):
+                return f'Ошибка: sum возможен только по столбцу типа int или bool, а не "{col}".' # noqa: E501
+            aggregates.append(["sum", col])
+        elif item in table_columns:
+            columns.append(item)
+        else:
+            return f'Ошибка: Столбец "{item}" не найден в таблице.'
+
+    if not columns and not aggregates:
+        return "Ошибка: не указаны столбцы представления."
+    if columns and aggregates:
+        return "Ошибка: нельзя смешивать столбцы и агрегаты в одном представлении."
+
+    view = {
+        "table": table_name,
+        "columns": columns or None,
+        "aggregates": aggregates or None,
+        "where": where_clause or None,
+    }
+
+    from primitive_db.utils import load_table_data, save_table_data
+    rows = [dict.fromkeys(view_columns(view), 0)] if aggregates else []
+    base = load_table_data(table_name, metadata["tables"][table_name])
+    _apply_view_changes(view, rows, [(None, row) for row in base])
+    save_table_data(view_name, rows)
+
+    metadata["views"][view_name] = view
+    return f'Представление "{view_name}" успешно создано: {", ".join(view_columns(view))}.' # noqa: E501
+
+
+@handle_db_errors
+def drop_view(metadata: Dict, view_name: str) -> str:
+    """
+    Удаляет представление и его данные.
+
+    Args:
+        metadata: словарь метаданных БД.
+        view_name: имя представления.
+
+    Returns:
+        Сообщение о результате.
+    """
+
+    if view_name not in metadata.get("views", {}):
+        return f'Ошибка: Представление "{view_name}" не существует.'
+
+    from primitive_db.utils import DATA_DIR
+    del metadata["views"][view_name]
+    (DATA_DIR / f"{view_name}.json").unlink(missing_ok=True)
+    return f'Представление "{view_name}" успешно удалено.'
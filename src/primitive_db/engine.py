@@ -6,16 +6,43 @@ from prettytable import PrettyTable
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
 
-from .core import create_table, delete, drop_table, insert, list_tables, select, update
-from .utils import load_metadata, load_table_data, save_metadata, save_table_data
+from . import cdc
+from .backup import backup, restore
+from .core import (
+    alter_table,
+    create_table,
+    create_view,
+    delete_from,
+    drop_table,
+    drop_view,
+    insert,
+    list_tables,
+    rewrite_table,
+    select,
+    set_storage,
+    update_table,
+    view_columns,
+)
+from .utils import (
+    load_metadata,
+    load_table_data,
+    save_metadata,
+    scan_table,
+    storage_of,
+)
 
 # Путь к файлу метаданных
 METADATA_FILE = "metadata.json"  # ← Исправлено: должно быть metadata.json, как в core
 # Если хочешь оставить db_meta.json — передавай его везде
 
+# Сколько событий журнала изменений показывать за раз
+SUBSCRIBE_BATCH = 20
+
 # Автодополнение команд
 completer = WordCompleter([
-    "create_table", "drop_table", "list_tables",
+    "create_table", "drop_table", "list_tables", "alter_table",
+    "set_storage", "create_view", "drop_view", "subscribe",
+    "snapshot", "backup", "restore",
     "insert into", "select from", "update", "delete from", "info",
     "help", "exit"
 ], ignore_case=True)
@@ -26,14 +53,28 @@ def print_help():
     print("\n***Операции с таблицами***")
     print("Функции:")
     print("create_table <имя> <столбец1:тип> ...  - создать таблицу")
+    print("    ... partition by range(ID) into N      - секции по N идентификаторов")
+    print("    ... partition by hash(столбец) into N  - N секций по хешу столбца")
     print("list_tables                              - показать все таблицы")
     print("drop_table <имя>                         - удалить таблицу")
+    print("alter_table <имя> add <столбец:тип> [default знач] - добавить столбец")
+    print("alter_table <имя> drop <столбец>         - удалить столбец")
+    print("alter_table <имя> rewrite                - переписать записи в новой схеме")
+    print("set_storage <имя> json|zlib|lzma [level=N] [block_size=N] - формат хранения")
+    print("create_view <имя> as select <столбцы|count|sum(столбец)> from <таблица> [where столбец=знач]") # noqa: E501
+    print("                                         - создать представление")
+    print("drop_view <имя>                          - удалить представление")
     print("\n***Операции с данными***")
     print("insert into <таблица> values (знач1, ...) - добавить запись")
     print("select from <таблица> [where столбец=знач] - выбрать данные")
     print("update <таблица> set поле=нов_знач where условие - обновить")
     print("delete from <таблица> where условие       - удалить по условию")
     print("info <таблица>                            - информация о таблице")
+    print("subscribe <таблица> [from смещение]       - журнал изменений таблицы")
+    print("\n***Резервное копирование***")
+    print("snapshot <папка>                         - снимок всей БД")
+    print("backup <папка> [--incremental]           - резервная копия (изменений)")
+    print("restore <папка>                          - восстановить БД из копии")
     print("\nОбщие команды:")
     print("help - справка")
     print("exit - выход")
@@ -164,7 +205,14 @@ def run():
                 else:
                     table_name = args[1]
                     columns = args[2:]
-                    result = create_table(metadata, table_name, columns)
+                    partition = None
+                    # create_table ... partition by range(ID)|hash(столбец) into N
+                    if "partition" in columns:
+                        idx = columns.index("partition")
+                        columns, partition = columns[:idx], columns[idx + 1:]
+                        if partition[:1] == ["by"]:
+                            partition = partition[1:]
+                    result = create_table(metadata, table_name, columns, partition)
                     print(result)
                     if "успешно" in result:
                         save_metadata(data=metadata)
@@ -184,6 +232,62 @@ def run():
                     if "успешно" in result:
                         save_metadata(data=metadata)
 
+            # === ALTER TABLE ===
+            elif cmd == "alter_table":
+                if len(args) < 3:
+                    print("Использование: alter_table <имя> add|drop|rewrite ...")
+                elif args[2] == "rewrite":
+                    print(rewrite_table(metadata, args[1]))
+                else:
+                    result = alter_table(metadata, args[1], args[2], args[3:])
+                    print(result)
+                    if result and "успешно" in result:
+                        save_metadata(data=metadata)
+
+            # === SET STORAGE ===
+            elif cmd == "set_storage":
+                if len(args) < 3:
+                    print("Использование: set_storage <имя> json|zlib|lzma [level=N] [block_size=N]") # noqa: E501
+                else:
+                    result = set_storage(metadata, args[1], args[2], args[3:])
+                    print(result)
+                    if result and "успешно" in result:
+                        save_metadata(data=metadata)
+
+            # === CREATE VIEW ===
+            elif cmd == "create_view":
+                # create_view <имя> as select <проекция> from <таблица> [where ...]
+                if (len(args) < 7 or args[2] != "as" or args[3] != "select"
+                        or "from" not in args):
+                    print("Пример: create_view adults as select name, age from users where active=true") # noqa: E501
+                    continue
+                from_index = args.index("from")
+                projection = [
+                    item.strip()
+                    for item in " ".join(args[4:from_index]).split(",")
+                    if item.strip()
+                ]
+                where_clause = None
+                if "where" in args:
+                    where_str = " ".join(args[args.index("where") + 1:])
+                    where_clause = parse_where_clause(where_str)
+                result = create_view(
+                    metadata, args[1], args[from_index + 1], projection, where_clause
+                )
+                print(result)
+                if result and "успешно" in result:
+                    save_metadata(data=metadata)
+
+            # === DROP VIEW ===
+            elif cmd == "drop_view":
+                if len(args) != 2:
+                    print("Использование: drop_view <имя>")
+                else:
+                    result = drop_view(metadata, args[1])
+                    print(result)
+                    if "успешно" in result:
+                        save_metadata(data=metadata)
+
             # === INSERT INTO ===
             elif cmd == "insert" and len(args) > 1 and args[1] == "into":
                 if len(args) < 3:
@@ -223,7 +327,8 @@ def run():
                     print("Использование: select from <таблица> [where ...]")
                     continue
                 table_name = args[2]
-                if table_name not in metadata["tables"]:
+                views = metadata.get("views", {})
+                if table_name not in metadata["tables"] and table_name not in views:
                     print(f"Ошибка: таблица '{table_name}' не существует.")
                     continue
 
@@ -232,9 +337,18 @@ def run():
                     where_part = user_input.split("where", 1)[1].strip()
                     where_clause = parse_where_clause(where_part)
 
-                data = load_table_data(table_name)
-                result_data = select(data, where_clause)
-                print_table(result_data, metadata["tables"][table_name]["columns"])
+                if table_name in views:
+                    # Представление хранится как готовая небольшая таблица
+                    data = load_table_data(table_name)
+                    columns = dict.fromkeys(view_columns(views[table_name]))
+                    result_data = select(data, where_clause, cached=False)
+                else:
+                    data = scan_table(
+                        table_name, metadata["tables"][table_name], where_clause
+                    )
+                    columns = metadata["tables"][table_name]["columns"]
+                    result_data = select(data, where_clause)
+                print_table(result_data, columns)
 
             # === UPDATE ===
             elif cmd == "update" and len(args) > 1:
@@ -254,10 +368,13 @@ def run():
                 set_clause = parse_set_clause(set_str)
                 where_clause = parse_where_clause(where_str)
 
-                data = load_table_data(table_name)
-                updated = update(data, set_clause, where_clause)
+                if table_name not in metadata["tables"]:
+                    print(f"Ошибка: таблица '{table_name}' не существует.")
+                    continue
+                updated = update_table(metadata, table_name, set_clause, where_clause)
+                if updated is None:
+                    continue
                 if updated > 0:
-                    save_table_data(table_name, data)
                     print(f"Обновлено {updated} записей.")
                 else:
                     print("Не найдено записей для обновления.")
@@ -271,15 +388,83 @@ def run():
                 where_str = " ".join(args[args.index("where") + 1:])
                 where_clause = parse_where_clause(where_str)
 
-                data = load_table_data(table_name)
-                old_count = len(data)
-                new_data = delete(data, where_clause)
-                if len(new_data) < old_count:
-                    save_table_data(table_name, new_data)
+                if table_name not in metadata["tables"]:
+                    print(f"Ошибка: таблица '{table_name}' не существует.")
+                    continue
+                deleted = delete_from(metadata, table_name, where_clause)
+                if deleted is None:
+                    continue
+                if deleted > 0:
                     print("Запись успешно удалена.")
                 else:
                     print("Не найдено записей для удаления.")
 
+            # === SUBSCRIBE ===
+            elif cmd == "subscribe":
+                if len(args) not in (2, 4) or (len(args) == 4 and args[2] != "from"):
+                    print("Использование: subscribe <таблица> [from смещение]")
+                    continue
+                table_name = args[1]
+                if table_name not in metadata["tables"]:
+                    print(f"Ошибка: таблица '{table_name}' не существует.")
+                    continue
+                offset = int(args[3]) if len(args) == 4 else None
+                if offset is not None and offset > cdc.next_offset():
+                    print(f"Ошибка: смещение {offset} за концом журнала (следующее событие — {cdc.next_offset()}).") # noqa: E501
+                    continue
+                consumer = f"cli:{table_name}"
+                try:
+                    events = cdc.subscribe(
+                        table_name, offset, consumer, SUBSCRIBE_BATCH
+                    )
+                    event = next(events, None)
+                except ValueError as e:
+                    print(f"{e} Чтение с самого раннего события.")
+                    events = cdc.subscribe(
+                        table_name, cdc.oldest_offset(), consumer, SUBSCRIBE_BATCH
+                    )
+                    event = next(events, None)
+
+                shown = 0
+                while event is not None:
+                    print(
+                        f"[{event['offset']}] {event['op']} {event['table']} "
+                        f"ID={event['id']}: {event['before']} -> {event['after']}"
+                    )
+                    shown += 1
+                    # Следующую порцию показываем только по запросу
+                    if shown % SUBSCRIBE_BATCH == 0:
+                        answer = input("Показать ещё? [y/n]: ").strip().lower()
+                        if answer != "y":
+                            # close() сохраняет смещение после показанного события
+                            events.close()
+                            break
+                    event = next(events, None)
+                if not shown:
+                    print("Новых изменений нет.")
+
+            # === SNAPSHOT / BACKUP / RESTORE ===
+            elif cmd == "snapshot":
+                if len(args) != 2:
+                    print("Использование: snapshot <папка>")
+                else:
+                    print(backup(args[1]))
+
+            elif cmd == "backup":
+                paths = [arg for arg in args[1:] if arg != "--incremental"]
+                if len(paths) != 1:
+                    print("Использование: backup <папка> [--incremental]")
+                else:
+                    print(backup(paths[0], incremental="--incremental" in args))
+
+            elif cmd == "restore":
+                if len(args) != 2:
+                    print("Использование: restore <папка>")
+                else:
+                    result = restore(args[1])
+                    if result:
+                        print(result)
+
             # === INFO ===
             elif cmd == "info":
                 if len(args) != 2:
@@ -291,8 +476,11 @@ def run():
                     else:
                         t = metadata["tables"][table_name]
                         cols = ", ".join([f"{k}:{v}" for k, v in t["columns"].items()])
-                        data = load_table_data(table_name)
+                        data = load_table_data(table_name, t)
                         print(f"Таблица: {table_name}\nСтолбцы: {cols}\nЗаписей: {len(data)}") # noqa: E501
+                        storage = storage_of(t)
+                        if storage["format"] != "json":
+                            print(f"Хранение: {storage['format']}, level={storage['level']}, block_size={storage['block_size']}") # noqa: E501
 
             # === HELP / EXIT ===
             elif cmd == "help":
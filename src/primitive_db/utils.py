@@ -1,31 +1,440 @@
 # src/primitive_db/utils.py
 
 import json
+import lzma
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 # Пути
 DATA_DIR = Path(__file__).parent / "data"
 METADATA_FILE = Path(__file__).parent / "metadata.json"  # ← добавили
 
+# Сколько секций читать одновременно
+SCAN_WORKERS = 4
+
+# Блочный формат хранения: значения по умолчанию и сигнатура файла
+DEFAULT_BLOCK_SIZE = 1000
+DEFAULT_LEVEL = 6
+BLOCK_MAGIC = b"PDBBLK1\n"
+
 def ensure_data_dir():
     """Создаёт папку data, если её ещё нет"""
     DATA_DIR.mkdir(exist_ok=True)
 
-def load_table_data(table_name):
-    """Загружает данные таблицы из файла data/<table_name>.json"""
-    ensure_data_dir()
-    file_path = DATA_DIR / f"{table_name}.json"
+@contextmanager
+def atomic_open(file_path, mode='w'):
+    """
+    Открывает файл для записи так, чтобы он заменился целиком.
+    Данные пишутся во временный <файл>.tmp, который после закрытия
+    атомарно подменяет исходный (os.replace). Старая версия файла при этом
+    не изменяется, поэтому жёсткие ссылки на неё (снимки) остаются целыми.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def upgrade_rows(rows, table_meta):
+    """
+    Приводит записи, сохранённые под старыми версиями схемы, к текущей.
+
+    Версия схемы записи хранится в служебном поле "_v" (нет поля — версия 0).
+    К записи последовательно применяются все изменения схемы из
+    table_meta["schema_changes"], которые новее её версии. Файл при этом
+    не перезаписывается: обновлённые записи попадут на диск при следующем
+    сохранении таблицы.
+    Возвращает True, если хотя бы одна запись была изменена.
+    """
+    version = table_meta.get("schema_version", 0)
+    if not version:
+        return False
+
+    changes = table_meta.get("schema_changes", [])
+    upgraded = False
+    for row in rows:
+        row_version = row.get("_v", 0)
+        if row_version >= version:
+            continue
+        for change in changes:
+            if change["version"] <= row_version:
+                continue
+            if change["op"] == "add":
+                row[change["column"]] = change.get("default")
+            elif change["op"] == "drop":
+                row.pop(change["column"], None)
+        row["_v"] = version
+        upgraded = True
+    return upgraded
+
+# --- Формат хранения ---
+def storage_of(table_meta):
+    """
+    Возвращает настройки хранения таблицы из метаданных.
+    По умолчанию — обычный JSON; для блочного формата:
+    {"format": "zlib"|"lzma", "level": 0..9, "block_size": N}.
+    """
+    storage = (table_meta or {}).get("storage") or {}
+    if storage.get("format", "json") == "json":
+        return {"format": "json"}
+    return {
+        "format": storage["format"],
+        "level": storage.get("level", DEFAULT_LEVEL),
+        "block_size": storage.get("block_size", DEFAULT_BLOCK_SIZE),
+    }
+
+def _suffix(table_meta):
+    """Расширение файлов таблицы: .json или .blk (блочный формат)"""
+    return ".json" if storage_of(table_meta)["format"] == "json" else ".blk"
+
+def _zone_map(rows):
+    """
+    Строит карту зон блока: для каждого столбца — число пустых значений
+    и min/max (только если все непустые значения одного типа).
+    """
+    zone = {}
+    for key in {key for row in rows for key in row}:
+        values = [row.get(key) for row in rows]
+        present = [v for v in values if v is not None]
+        entry = {"nulls": len(values) - len(present)}
+        if present and len({type(v) for v in present}) == 1:
+            entry["min"] = min(present)
+            entry["max"] = max(present)
+        zone[key] = entry
+    return zone
+
+def _block_may_match(zone, where_clause, table_meta=None):
+    """
+    Проверяет по карте зон, может ли в блоке быть запись под условие where.
+    Условие сравнивается как строки (как в core.select), поэтому значение
+    приводится к типу столбца; если привести нельзя — блок не пропускаем.
+
+    Карта зон построена по записям в том виде, в каком они сохранены, а
+    обновление схемы (upgrade_rows) применяется уже после чтения. Поэтому
+    столбцы, затронутые изменениями схемы новее самой старой записи блока
+    (минимум "_v" в карте зон), для отсечения не используются.
+    """
+    version = zone.get("_v")
+    oldest = version["min"] if version and not version["nulls"] else 0
+    stale = {
+        change["column"]
+        for change in (table_meta or {}).get("schema_changes", [])
+        if change["version"] > oldest
+    }
+
+    for key, value in where_clause.items():
+        if key in stale:
+            continue
+        text = str(value)
+        entry = zone.get(key)
+        if entry is None:
+            # Столбца нет ни в одной записи блока: row.get() даст None
+            if text != "None":
+                return False
+            continue
+        if "min" not in entry or (entry["nulls"] and text == "None"):
+            continue
+
+        low, high = entry["min"], entry["max"]
+        if isinstance(low, bool):
+            if text not in ("True", "False"):
+                return False
+            target = text == "True"
+        elif isinstance(low, int):
+            try:
+                target = int(text)
+            except ValueError:
+                return False
+        elif isinstance(low, str):
+            target = text
+        else:
+            continue
+        if target < low or target > high:
+            return False
+    return True
+
+def _compress(payload, storage):
+    if storage["format"] == "lzma":
+        return lzma.compress(payload, preset=storage["level"])
+    return zlib.compress(payload, storage["level"])
+
+def _decompress(payload, codec):
+    if codec == "lzma":
+        return json.loads(lzma.decompress(payload))
+    return json.loads(zlib.decompress(payload))
+
+def _write_blocks(file_path, rows, storage):
+    """
+    Записывает записи блоками: BLOCK_MAGIC, затем для каждого блока —
+    длина заголовка (4 байта), заголовок JSON {rows, size, codec, zone}
+    и сжатые данные блока.
+    """
+    size = storage["block_size"]
+    with atomic_open(file_path, 'wb') as f:
+        f.write(BLOCK_MAGIC)
+        for start in range(0, len(rows), size):
+            block = rows[start:start + size]
+            payload = _compress(
+                json.dumps(block, ensure_ascii=False).encode("utf-8"), storage
+            )
+            header = json.dumps({
+                "rows": len(block),
+                "size": len(payload),
+                "codec": storage["format"],
+                "zone": _zone_map(block),
+            }, ensure_ascii=False).encode("utf-8")
+            f.write(len(header).to_bytes(4, "big"))
+            f.write(header)
+            f.write(payload)
+
+def _read_blocks(file_path, where_clause=None, table_meta=None):
+    """
+    Читает блочный файл. Блоки, которые по карте зон не подходят под
+    where, не читаются и не распаковываются; остальные распаковываются
+    в пуле потоков.
+    """
+    wanted = []
+    with open(file_path, 'rb') as f:
+        if f.read(len(BLOCK_MAGIC)) != BLOCK_MAGIC:
+            raise ValueError(f"Файл {file_path} не является блочным файлом таблицы.")
+        while True:
+            raw_len = f.read(4)
+            if not raw_len:
+                break
+            header = json.loads(f.read(int.from_bytes(raw_len, "big")))
+            zone = header["zone"]
+            if where_clause and not _block_may_match(zone, where_clause, table_meta):
+                f.seek(header["size"], 1)
+                continue
+            wanted.append((f.read(header["size"]), header["codec"]))
+
+    if len(wanted) <= 1:
+        blocks = [_decompress(*item) for item in wanted]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(wanted), SCAN_WORKERS)) as pool:
+            blocks = list(pool.map(lambda item: _decompress(*item), wanted))
+    return [row for block in blocks for row in block]
+
+def _read_rows(file_path, where_clause=None, table_meta=None):
+    """
+    Читает список записей из файла таблицы (нет файла — пустой список).
+    where_clause разрешает пропускать блоки блочного файла; для полного
+    чтения (перед перезаписью) его передавать нельзя. table_meta нужен,
+    чтобы не отсекать блоки по столбцам с изменённой схемой.
+    """
+    if not file_path.exists():
+        return []
+    if file_path.suffix == ".blk":
+        return _read_blocks(file_path, where_clause, table_meta)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_rows(file_path, rows, table_meta=None):
+    """Записывает список записей в файл в формате хранения таблицы"""
+    storage = storage_of(table_meta)
+    if storage["format"] == "json":
+        with atomic_open(file_path) as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    else:
+        _write_blocks(file_path, rows, storage)
+
+# --- Секционирование (partitioning) ---
+def partition_of(row, spec):
+    """
+    Возвращает номер секции для записи.
+    range — по ID: в секции k лежат ID от k*size+1 до (k+1)*size;
+    hash — crc32 от строкового значения столбца по модулю числа секций
+    (строковое значение — так же, как сравнивает условие where).
+    """
+    value = row.get(spec["column"])
+    if spec["kind"] == "range":
+        return (int(value) - 1) // spec["size"]
+    return zlib.crc32(str(value).encode("utf-8")) % spec["count"]
+
+def prune_partitions(table_meta, where_clause):
+    """
+    Определяет по условию where номера секций, в которых могут быть записи.
+    Возвращает None, если отсечь секции нельзя (нужны все).
+    """
+    spec = table_meta.get("partition") if table_meta else None
+    if not spec or not where_clause or spec["column"] not in where_clause:
+        return None
+    value = where_clause[spec["column"]]
+    if spec["kind"] == "range":
+        try:
+            value = int(str(value))
+        except ValueError:
+            return None
+    return [partition_of({spec["column"]: value}, spec)]
+
+def partition_dir(table_name):
+    """Папка с секциями таблицы: data/<table_name>/"""
+    return DATA_DIR / table_name
+
+def partition_path(table_name, part, table_meta=None):
+    """Файл секции: data/<table_name>/part_<номер>.json (или .blk)"""
+    return partition_dir(table_name) / f"part_{part}{_suffix(table_meta)}"
+
+def list_partitions(table_name, table_meta=None):
+    """Номера существующих секций таблицы по возрастанию"""
+    folder = partition_dir(table_name)
+    if not folder.exists():
+        return []
+    return sorted(
+        int(p.stem.split("_", 1)[1])
+        for p in folder.glob(f"part_*{_suffix(table_meta)}")
+    )
+
+def table_files(table_name, table_meta=None):
+    """Все файлы с записями таблицы в её текущем формате хранения"""
+    if table_meta and table_meta.get("partition"):
+        return [
+            partition_path(table_name, part, table_meta)
+            for part in list_partitions(table_name, table_meta)
+        ]
+    file_path = DATA_DIR / f"{table_name}{_suffix(table_meta)}"
+    return [file_path] if file_path.exists() else []
+
+def upgrade_table(table_name, table_meta):
+    """
+    Переписывает в текущей версии схемы файлы таблицы (или секции),
+    в которых есть записи старых версий; остальные файлы не трогает.
+    Возвращает True, если был переписан хотя бы один файл.
+    """
+    upgraded = False
+    for file_path in table_files(table_name, table_meta):
+        rows = _read_rows(file_path)
+        if upgrade_rows(rows, table_meta):
+            _write_rows(file_path, rows, table_meta)
+            upgraded = True
+    return upgraded
+
+def load_partitions(table_name, table_meta, parts, where_clause=None):
+    """
+    Загружает указанные секции параллельно (пул потоков).
+    Возвращает словарь {номер секции: список записей}.
+    """
+    def read(part):
+        file_path = partition_path(table_name, part, table_meta)
+        return _read_rows(file_path, where_clause, table_meta)
+
+    if len(parts) <= 1:
+        loaded = [read(p) for p in parts]
+    else:
+        workers = min(len(parts), SCAN_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(read, parts))
+    for rows in loaded:
+        upgrade_rows(rows, table_meta)
+    return dict(zip(parts, loaded))
+
+def load_last_id(table_name, table_meta):
+    """
+    Возвращает последний выданный ID секционированной таблицы.
+    Хранится в data/<table_name>/last_id.json, чтобы вставка не читала
+    все секции; если файла нет — вычисляется сканированием.
+    """
+    file_path = partition_dir(table_name) / "last_id.json"
     if file_path.exists():
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
-    return []
+    parts = list_partitions(table_name, table_meta)
+    if table_meta["partition"]["kind"] == "range":
+        parts = parts[-1:]
+    rows = load_partitions(table_name, table_meta, parts)
+    return max((r["ID"] for part in rows.values() for r in part), default=0)
 
-def save_table_data(table_name, data):
-    """Сохраняет данные таблицы в файл data/<table_name>.json"""
+def append_row(table_name, table_meta, row):
+    """Добавляет запись в секционированную таблицу, переписывая одну секцию"""
+    partition_dir(table_name).mkdir(parents=True, exist_ok=True)
+    part = partition_of(row, table_meta["partition"])
+    file_path = partition_path(table_name, part, table_meta)
+    rows = _read_rows(file_path)
+    rows.append(row)
+    _write_rows(file_path, rows, table_meta)
+    with atomic_open(partition_dir(table_name) / "last_id.json") as f:
+        json.dump(row["ID"], f)
+
+def _load(table_name, table_meta, where_clause, skip_blocks):
     ensure_data_dir()
-    file_path = DATA_DIR / f"{table_name}.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    block_filter = where_clause if skip_blocks else None
+    if table_meta and table_meta.get("partition"):
+        parts = prune_partitions(table_meta, where_clause)
+        if parts is None:
+            parts = list_partitions(table_name, table_meta)
+        loaded = load_partitions(table_name, table_meta, parts, block_filter)
+        data = [row for part in parts for row in loaded[part]]
+        if table_meta["partition"]["kind"] == "hash":
+            data.sort(key=lambda row: row["ID"])
+        return data
+
+    file_path = DATA_DIR / f"{table_name}{_suffix(table_meta)}"
+    data = _read_rows(file_path, block_filter, table_meta)
+    if table_meta is not None:
+        upgrade_rows(data, table_meta)
+    return data
+
+def load_table_data(table_name, table_meta=None, where_clause=None):
+    """
+    Загружает данные таблицы из файла data/<table_name>.json
+    (для секционированной таблицы — из data/<table_name>/part_*.json,
+    для блочного формата хранения — из файлов .blk).
+
+    Если передано описание таблицы из метаданных — записи старых версий
+    схемы обновляются на лету (см. upgrade_rows). Если передано условие
+    where — читаются только секции, которые могут ему соответствовать;
+    фильтрацию самих записей выполняет вызывающий код.
+    """
+    return _load(table_name, table_meta, where_clause, skip_blocks=False)
+
+def scan_table(table_name, table_meta, where_clause=None):
+    """
+    Читает записи таблицы для запроса select: кроме секций, по картам
+    зон пропускаются блоки, в которых нет записей под условие where.
+    Результат нельзя сохранять обратно через save_table_data.
+    """
+    return _load(table_name, table_meta, where_clause, skip_blocks=True)
+
+def save_table_data(table_name, data, table_meta=None, where_clause=None):
+    """
+    Сохраняет данные таблицы в файл data/<table_name>.json
+    (в формате хранения, указанном в метаданных таблицы).
+
+    Для секционированной таблицы data — содержимое секций, загруженных
+    load_table_data с тем же where_clause: перезаписываются только они
+    (опустевшие секции удаляются), а записи, сменившие секцию после
+    update, дописываются в свои секции.
+    """
+    ensure_data_dir()
+    if not (table_meta and table_meta.get("partition")):
+        _write_rows(DATA_DIR / f"{table_name}{_suffix(table_meta)}", data, table_meta)
+        return
+
+    spec = table_meta["partition"]
+    parts = prune_partitions(table_meta, where_clause)
+    if parts is None:
+        parts = list_partitions(table_name, table_meta)
+
+    groups = {}
+    for row in data:
+        groups.setdefault(partition_of(row, spec), []).append(row)
+
+    partition_dir(table_name).mkdir(parents=True, exist_ok=True)
+    for part in parts:
+        if part not in groups:
+            partition_path(table_name, part, table_meta).unlink(missing_ok=True)
+    for part, rows in groups.items():
+        file_path = partition_path(table_name, part, table_meta)
+        if part not in parts:
+            rows = _read_rows(file_path) + rows
+        _write_rows(file_path, rows, table_meta)
 
 def load_metadata(filepath=None):
     """
@@ -59,5 +468,5 @@ def save_metadata(filepath=None, data=None):
     if data is None:
         data = {"tables": {}}
 
-    with open(filepath, "w", encoding="utf-8") as f:
+    with atomic_open(filepath) as f:
         json.dump(data, f, ensure_ascii=False, indent=2)